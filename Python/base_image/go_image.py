@@ -1,7 +1,28 @@
 import re
-from Orchestration.types import GoBuildType, GO_BUILD_FILES
+from Orchestration.types import GoBuildType, InstallPlan
+from Orchestration.helper import detect_build_type
 DEFAULT_GO_VERSION = "1.22"
 
+_GO_VERSION_RE = re.compile(r'^go[ \t]+([\d.]+)', re.MULTILINE)
+
+# The `go X.Y` directive sits right under `module ...` in practice
+_HEAD_LINES = 32
+_VERSION_CHARS = "0123456789."
+
+
+def _go_directive(content: str) -> str | None:
+    # Fast path: only look at the first lines, without a regex. Same rules as
+    # _GO_VERSION_RE: unindented `go`, spaces/tabs, then the leading [\d.]+ run
+    for line in content.split("\n", _HEAD_LINES)[:_HEAD_LINES]:
+        if line.startswith("go") and line[2:3] in (" ", "\t"):
+            rest = line[2:].lstrip(" \t")
+            version = rest[:len(rest) - len(rest.lstrip(_VERSION_CHARS))]
+            if version:
+                return version
+
+    match = _GO_VERSION_RE.search(content)
+    return match.group(1) if match else None
+
 
 def resolve_go_version(files: dict) -> str:
     """
@@ -13,15 +34,15 @@ def resolve_go_version(files: dict) -> str:
 
     # 1️⃣ go.mod
     if "go.mod" in files:
-        match = re.search(r'^go\s+([\d.]+)', files["go.mod"], re.MULTILINE)
-        if match:
-            return match.group(1)
+        version = _go_directive(files["go.mod"])
+        if version:
+            return version
 
     # 2️⃣ go.work (rare)
     if "go.work" in files:
-        match = re.search(r'^go\s+([\d.]+)', files["go.work"], re.MULTILINE)
-        if match:
-            return match.group(1)
+        version = _go_directive(files["go.work"])
+        if version:
+            return version
 
     # fallback
     return DEFAULT_GO_VERSION
@@ -32,13 +53,10 @@ def go_version_to_image(version: str) -> str:
 
 
 def detect_go_build_type(files: dict) -> GoBuildType:
-    for build_type, indicators in GO_BUILD_FILES.items():
-        if any(f in files for f in indicators):
-            return build_type
-    return GoBuildType.UNKNOWN
+    return detect_build_type(files, "go")
 
-def go_install_commands(build_type: GoBuildType) -> list[str]:
-    return [
+def go_install_commands(build_type: GoBuildType) -> InstallPlan:
+    return InstallPlan([
         # Download dependencies first (better caching)
         "COPY go.mod go.sum* ./",
         "RUN go mod download",
@@ -51,4 +69,4 @@ def go_install_commands(build_type: GoBuildType) -> list[str]:
 
         # Default run command
         'CMD ["./app"]'
-    ]
+    ], has_cmd=True)
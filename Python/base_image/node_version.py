@@ -1,25 +1,20 @@
 import json
 import re
-from packaging.specifiers import SpecifierSet
 from packaging.version import Version
-from Orchestration.types import JSBuildType, JS_BUILD_FILES 
+from Orchestration.types import JSBuildType, InstallPlan
+from Orchestration.helper import detect_build_type
+from Orchestration.base_image.version_range import highest_compatible
 SUPPORTED_NODE_VERSIONS = ["16", "18", "20", "21"]
 DEFAULT_NODE_VERSION = "20"
 
+_SUPPORTED_NODE = sorted(((v, Version(v)) for v in SUPPORTED_NODE_VERSIONS), key=lambda c: c[1])
+
 
 def choose_highest_node(specifier: str) -> str:
     try:
-        spec = SpecifierSet(specifier)
-        compatible = [
-            v for v in SUPPORTED_NODE_VERSIONS
-            if Version(v) in spec
-        ]
-        if compatible:
-            return compatible[-1]
+        return highest_compatible(specifier, _SUPPORTED_NODE) or DEFAULT_NODE_VERSION
     except Exception:
-        pass
-
-    return DEFAULT_NODE_VERSION
+        return DEFAULT_NODE_VERSION
 
 
 def resolve_node_version(files: dict) -> str:
@@ -60,42 +55,39 @@ def resolve_node_version(files: dict) -> str:
 
 
 def detect_js_build_type(files: dict) -> JSBuildType:
-    for build_type, indicators in JS_BUILD_FILES.items():
-        if any(f in files for f in indicators):
-            return build_type
-    return JSBuildType.UNKNOWN
+    return detect_build_type(files, "javascript")
 
 
 
 from Orchestration.types import JSBuildType
 
 
-def js_install_commands(build_type: JSBuildType) -> list[str]:
+def js_install_commands(build_type: JSBuildType) -> InstallPlan:
     
     if build_type == JSBuildType.PNPM:
-        return [
+        return InstallPlan([
             "RUN npm install -g pnpm",
             "COPY package.json pnpm-lock.yaml ./",
             "RUN pnpm install --frozen-lockfile"
-        ]
+        ])
 
     elif build_type == JSBuildType.YARN:
-        return [
+        return InstallPlan([
             "COPY package.json yarn.lock ./",
             "RUN yarn install --frozen-lockfile"
-        ]
+        ])
 
     elif build_type == JSBuildType.NPM:
-        return [
+        return InstallPlan([
             "COPY package.json package-lock.json* ./",
             "RUN npm ci"
-        ]
+        ])
 
     # fallback if only package.json
-    return [
+    return InstallPlan([
         "COPY package.json ./",
         "RUN npm install"
-    ]
+    ])
 
 
 DEFAULT_NODE_VERSION = "20"
@@ -1,7 +1,15 @@
 import re
-from packaging.specifiers import SpecifierSet
 from packaging.version import Version
-from Orchestration.types import PythonBuildType, PYTHON_BUILD_FILES
+from Orchestration.types import PythonBuildType, InstallPlan
+from Orchestration.helper import detect_build_type
+from Orchestration.base_image.version_range import highest_compatible
+
+_RUNTIME_RE = re.compile(r"python-?([\d\.]+)")
+_PY_REQUIRES_RE = re.compile(r'requires-python\s*=\s*"([^"]+)"')
+_POETRY_PY_RE = re.compile(r'python\s*=\s*"([^"]+)"')
+_PIPFILE_RE = re.compile(r'python_version\s*=\s*"([^"]+)"')
+_SETUP_RE = re.compile(r'python_requires\s*=\s*"([^"]+)"')
+
 SUPPORTED_PYTHON_VERSIONS = [
     "3.8",
     "3.9",
@@ -12,6 +20,9 @@ SUPPORTED_PYTHON_VERSIONS = [
 
 DEFAULT_VERSION = "3.11"
 
+# Parsed once, kept sorted so the highest match can be bisected
+_SUPPORTED = sorted(((v, Version(v)) for v in SUPPORTED_PYTHON_VERSIONS), key=lambda c: c[1])
+
 
 def choose_highest_compatible(specifier: str) -> str:
     """
@@ -19,17 +30,9 @@ def choose_highest_compatible(specifier: str) -> str:
     return highest compatible version from SUPPORTED list
     """
     try:
-        spec = SpecifierSet(specifier)
-        compatible = [
-            v for v in SUPPORTED_PYTHON_VERSIONS
-            if Version(v) in spec
-        ]
-        if compatible:
-            return compatible[-1]  # highest
+        return highest_compatible(specifier, _SUPPORTED) or DEFAULT_VERSION
     except Exception:
-        pass
-
-    return DEFAULT_VERSION
+        return DEFAULT_VERSION
 
 
 def resolve_python_version(files: dict) -> str:
@@ -48,88 +51,85 @@ def resolve_python_version(files: dict) -> str:
 
     # 2️⃣ runtime.txt
     if "runtime.txt" in files:
-        match = re.search(r"python-?([\d\.]+)", files["runtime.txt"])
+        match = _RUNTIME_RE.search(files["runtime.txt"])
         if match:
             return match.group(1)
 
     # 3️⃣ pyproject.toml
     if "pyproject.toml" in files:
         content = files["pyproject.toml"]
-        match = re.search(r'requires-python\s*=\s*"([^"]+)"', content)
+        match = _PY_REQUIRES_RE.search(content)
         if match:
             return choose_highest_compatible(match.group(1))
 
         # poetry style
-        match = re.search(r'python\s*=\s*"([^"]+)"', content)
+        match = _POETRY_PY_RE.search(content)
         if match:
             return choose_highest_compatible(match.group(1))
 
     # 4️⃣ Pipfile
     if "Pipfile" in files:
-        match = re.search(r'python_version\s*=\s*"([^"]+)"', files["Pipfile"])
+        match = _PIPFILE_RE.search(files["Pipfile"])
         if match:
             return match.group(1)
 
     # 5️⃣ setup.py
     if "setup.py" in files:
-        match = re.search(r'python_requires\s*=\s*"([^"]+)"', files["setup.py"])
+        match = _SETUP_RE.search(files["setup.py"])
         if match:
             return choose_highest_compatible(match.group(1))
 
     # fallback
     return DEFAULT_VERSION
-resolve_python_version
+
 
 def python_version_to_image(version: str) -> str:
     return f"python:{version}-slim"
 
 
 def detect_python_build_type(files: dict) -> PythonBuildType:
-    for build_type, indicators in PYTHON_BUILD_FILES.items():
-        if any(f in files for f in indicators):
-            return build_type
-    return PythonBuildType.UNKNOWN
+    return detect_build_type(files, "python")
 
 
 
 from Orchestration.types import PythonBuildType
 
 
-def python_install_commands(build_type: PythonBuildType) -> list[str]:
+def python_install_commands(build_type: PythonBuildType) -> InstallPlan:
     if build_type == PythonBuildType.REQUIREMENTS:
-        return [
+        return InstallPlan([
             "COPY requirements.txt .",
             "RUN pip install --no-cache-dir -r requirements.txt"
-        ]
+        ])
 
     elif build_type == PythonBuildType.PYPROJECT:
-        return [
+        return InstallPlan([
             "COPY pyproject.toml .",
             "RUN pip install uv",
             "RUN uv sync"
-        ]
+        ])
 
     elif build_type == PythonBuildType.PIPFILE:
-        return [
+        return InstallPlan([
             "COPY Pipfile Pipfile.lock* .",
             "RUN pip install pipenv",
             "RUN pipenv install --system --deploy"
-        ]
+        ])
 
     elif build_type == PythonBuildType.SETUP:
-        return [
+        return InstallPlan([
             "COPY . .",
             "RUN pip install ."
-        ]
+        ])
 
     elif build_type == PythonBuildType.CONDA:
-        return [
+        return InstallPlan([
             "COPY environment.yml .",
             "RUN apt-get update && apt-get install -y curl",
             "RUN curl -sL https://repo.anaconda.com/miniconda.sh -o miniconda.sh",
             "RUN bash miniconda.sh -b -p /opt/conda",
             "ENV PATH=/opt/conda/bin:$PATH",
             "RUN conda env update -f environment.yml"
-        ]
+        ])
 
-    return []
+    return InstallPlan([])
@@ -1,7 +1,8 @@
 import re
 import tomllib
-from packaging.version import Version
-from Orchestration.types import RustBuildType, RUST_BUILD_FILES
+from Orchestration.types import RustBuildType, InstallPlan
+from Orchestration.helper import detect_build_type
+from Orchestration.base_image.version_range import parse_version
 SUPPORTED_RUST_VERSIONS = [
     "1.70",
     "1.71",
@@ -13,14 +14,38 @@ SUPPORTED_RUST_VERSIONS = [
 
 DEFAULT_RUST_VERSION = "stable"
 
+_SUPPORTED_RUST = [(v, parse_version(v)) for v in SUPPORTED_RUST_VERSIONS]
+
+# `name = "..."` is almost always within the first lines of [package]
+_HEAD_LINES = 32
+
+_CARGO_NAME_RE = re.compile(r'^name\s*=\s*"([^"]+)"', re.MULTILINE)
+_TOML_HEADER_RE = re.compile(r'^\s*\[', re.MULTILINE)
+_TOOLCHAIN_HEADER_RE = re.compile(r'^\s*\[toolchain\]\s*$', re.MULTILINE)
+_PACKAGE_HEADER_RE = re.compile(r'^\s*\[package\]\s*$', re.MULTILINE)
+_TOOLCHAIN_CHANNEL_RE = re.compile(r'^\s*channel\s*=\s*"([^"]+)"', re.MULTILINE)
+_RUST_VERSION_RE = re.compile(r'^\s*rust-version\s*=\s*"([^"]+)"', re.MULTILINE)
+
+
+def _toml_section(content: str, header_re: re.Pattern) -> str:
+    """
+    Return the body of the top-level table matched by header_re, or "" if it
+    is missing. Only meant for fast-path lookups of simple `key = "value"` entries.
+    """
+    match = header_re.search(content)
+    if not match:
+        return ""
+
+    start = match.end()
+    next_header = _TOML_HEADER_RE.search(content, start)
+    return content[start:next_header.start() if next_header else len(content)]
+
 
 def choose_highest_rust(min_version: str) -> str:
-    compatible = [
-        v for v in SUPPORTED_RUST_VERSIONS
-        if Version(v) >= Version(min_version)
-    ]
-    if compatible:
-        return compatible[-1]
+    min_v = parse_version(min_version)
+    for v, parsed in reversed(_SUPPORTED_RUST):
+        if parsed >= min_v:
+            return v
     return DEFAULT_RUST_VERSION
 
 
@@ -35,10 +60,17 @@ def resolve_rust_version(files: dict) -> str:
 
     # 1️⃣ rust-toolchain.toml
     if "rust-toolchain.toml" in files:
-        data = tomllib.loads(files["rust-toolchain.toml"].encode())
-        channel = data.get("toolchain", {}).get("channel")
-        if channel:
-            return channel
+        content = files["rust-toolchain.toml"]
+        match = _TOOLCHAIN_CHANNEL_RE.search(_toml_section(content, _TOOLCHAIN_HEADER_RE))
+        if match:
+            return match.group(1)
+
+        # Unusual layout (inline table, single quotes, ...) -> full parse,
+        # but only when the key is there at all
+        if "channel" in content:
+            channel = tomllib.loads(content).get("toolchain", {}).get("channel")
+            if channel:
+                return channel
 
     # 2️⃣ rust-toolchain
     if "rust-toolchain" in files:
@@ -46,9 +78,19 @@ def resolve_rust_version(files: dict) -> str:
 
     # 3️⃣ Cargo.toml
     if "Cargo.toml" in files:
-        data = tomllib.loads(files["Cargo.toml"].encode())
-        rust_version = data.get("package", {}).get("rust-version")
-        if rust_version:
+        content = files["Cargo.toml"]
+        match = _RUST_VERSION_RE.search(_toml_section(content, _PACKAGE_HEADER_RE))
+        if match:
+            rust_version = match.group(1)
+        elif "rust-version" in content:
+            manifest = tomllib.loads(content)
+            rust_version = manifest.get("package", {}).get("rust-version")
+            # `rust-version.workspace = true` inherits from [workspace.package]
+            if isinstance(rust_version, dict):
+                rust_version = manifest.get("workspace", {}).get("package", {}).get("rust-version")
+        else:
+            rust_version = None
+        if isinstance(rust_version, str):
             return choose_highest_rust(rust_version)
 
     # fallback
@@ -59,26 +101,35 @@ def rust_version_to_image(version: str) -> str:
     return f"rust:{version}"
 
 def detect_rust_build_type(files: dict) -> RustBuildType:
-    for build_type, indicators in RUST_BUILD_FILES.items():
-        if any(f in files for f in indicators):
-            return build_type
-    return RustBuildType.UNKNOWN
+    return detect_build_type(files, "rust")
 
 def get_rust_binary_name(files: dict) -> str:
-    import re
-
     if "Cargo.toml" in files:
-        match = re.search(r'^name\s*=\s*"([^"]+)"', files["Cargo.toml"], re.MULTILINE)
+        content = files["Cargo.toml"]
+
+        # Fast path: `name = "..."` under [package], which is almost always at the top
+        in_package = False
+        for line in content.split("\n", _HEAD_LINES)[:_HEAD_LINES]:
+            s = line.strip()
+            if s.startswith("["):
+                in_package = s == "[package]"
+            elif in_package and s.startswith("name"):
+                key, _, value = s.partition("=")
+                value = value.strip()
+                if key.strip() == "name" and value.startswith('"'):
+                    return value.split('"')[1]
+
+        match = _CARGO_NAME_RE.search(content)
         if match:
             return match.group(1)
 
     return "app"
 
 
-def rust_install_commands(build_type: RustBuildType, files: dict) -> list[str]:
+def rust_install_commands(build_type: RustBuildType, files: dict) -> InstallPlan:
     binary_name = get_rust_binary_name(files)
 
-    return [
+    return InstallPlan([
         # Copy manifests first (for Docker cache efficiency)
         "COPY Cargo.toml Cargo.lock* ./",
 
@@ -95,5 +146,5 @@ def rust_install_commands(build_type: RustBuildType, files: dict) -> list[str]:
 
         # Run correct binary
         f'CMD ["./target/release/{binary_name}"]'
-    ]
+    ], has_cmd=True)
 
@@ -0,0 +1,102 @@
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from packaging.specifiers import SpecifierSet
+from packaging.version import Version
+
+
+@lru_cache(maxsize=256)
+def parse_version(version: str) -> Version:
+    return Version(version)
+
+
+@lru_cache(maxsize=256)
+def parse_spec(specifier: str) -> SpecifierSet:
+    return SpecifierSet(specifier)
+
+
+def _upper_for_compatible(version: Version) -> Version:
+    # ~=3.8 -> <4 , ~=3.8.1 -> <3.9
+    prefix = version.release[:-1]
+    return Version(".".join(map(str, prefix[:-1] + (prefix[-1] + 1,))))
+
+
+@lru_cache(maxsize=256)
+def spec_bounds(specifier: str):
+    """
+    Reduce a specifier like '>=3.8,<4' to a single interval
+    (lo, lo_inclusive, hi, hi_inclusive); None on either side means unbounded.
+
+    Returns None when the specifier uses something that isn't a plain
+    interval (!=, ===, wildcards, pre/local versions), so callers can fall
+    back to the full SpecifierSet check.
+    """
+    lo, lo_incl = None, True
+    hi, hi_incl = None, True
+
+    def raise_lo(v: Version, inclusive: bool):
+        nonlocal lo, lo_incl
+        if lo is None or v > lo or (v == lo and not inclusive):
+            lo, lo_incl = v, inclusive
+
+    def lower_hi(v: Version, inclusive: bool):
+        nonlocal hi, hi_incl
+        if hi is None or v < hi or (v == hi and not inclusive):
+            hi, hi_incl = v, inclusive
+
+    for spec in parse_spec(specifier):
+        op = spec.operator
+        if op in ("!=", "===") or spec.version.endswith(".*"):
+            return None
+
+        v = parse_version(spec.version)
+        if v.is_prerelease or v.is_postrelease or v.local or v.epoch:
+            return None
+
+        if op == ">=":
+            raise_lo(v, True)
+        elif op == ">":
+            raise_lo(v, False)
+        elif op == "<=":
+            lower_hi(v, True)
+        elif op == "<":
+            lower_hi(v, False)
+        elif op == "==":
+            raise_lo(v, True)
+            lower_hi(v, True)
+        elif op == "~=":
+            raise_lo(v, True)
+            lower_hi(_upper_for_compatible(v), False)
+        else:
+            return None
+
+    return lo, lo_incl, hi, hi_incl
+
+
+def highest_compatible(specifier: str, candidates: list[tuple[str, Version]]) -> str | None:
+    """
+    candidates = [("3.8", Version("3.8")), ...] sorted ascending, final releases only.
+    Returns the highest candidate string allowed by the specifier, or None.
+    """
+    bounds = spec_bounds(specifier)
+
+    if bounds is None:
+        spec = parse_spec(specifier)
+        return next((v for v, parsed in reversed(candidates) if parsed in spec), None)
+
+    lo, lo_incl, hi, hi_incl = bounds
+
+    # Index just past the highest candidate that is still under the upper bound
+    if hi is None:
+        idx = len(candidates)
+    elif hi_incl:
+        idx = bisect_right(candidates, hi, key=lambda c: c[1])
+    else:
+        idx = bisect_left(candidates, hi, key=lambda c: c[1])
+
+    if idx == 0:
+        return None
+
+    v, parsed = candidates[idx - 1]
+    if lo is not None and (parsed < lo or (parsed == lo and not lo_incl)):
+        return None
+    return v
@@ -1,82 +1,225 @@
+import asyncio
+import functools
+import os
+import shelve
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
 from urllib.parse import urlparse
-from Orchestration.types import PythonBuildType,PYTHON_BUILD_FILES,LANGUAGE_BUILD_MAP
-from Orchestration.base_image.python_image import resolve_python_version
+from Orchestration.types import EXPECTED_FILES_BY_LANG, RepoFiles
 import requests
-def parse_github_url(repo_url: str):
-    parsed = urlparse(repo_url)
-    parts = parsed.path.strip("/").split("/")
-    return parts[0], parts[1]
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+GITHUB_API_TIMEOUT = 10
+
+# Shared by the requests adapter and the aiohttp batch path
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = (502, 503, 504)
+
+# One pooled session for every GitHub call, so repeated requests reuse the
+# same TCP/TLS connection instead of handshaking each time
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=RETRY_TOTAL, backoff_factor=RETRY_BACKOFF, status_forcelist=RETRY_STATUSES),
+    ),
+)
+SESSION.headers.update({
+    "Accept": "application/vnd.github+json",
+    "Accept-Encoding": "gzip",
+})
+if os.environ.get("GITHUB_TOKEN"):
+    SESSION.headers["Authorization"] = f"Bearer {os.environ['GITHUB_TOKEN']}"
+
+# On-disk ETag cache: a 304 reply has no body and doesn't count against the rate limit
+CACHE_PATH = Path.home() / ".cache" / "orchestration" / "gh.db"
+CACHE_TTL_SECONDS = 24 * 60 * 60
+RAW_MEDIA_TYPE = "application/vnd.github.raw"
+
+# shelve isn't safe for concurrent writers; batch runs read manifests from worker threads
+_CACHE_LOCK = threading.Lock()
+
+
+def _cache_lookup(key: str):
+    """
+    Return the stored {etag, data, fetched_at} entry for key, or None if
+    missing or older than a day
+    """
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+    with _CACHE_LOCK, shelve.open(str(CACHE_PATH)) as cache:
+        entry = cache.get(key)
+
+    if entry and time.time() - entry["fetched_at"] > CACHE_TTL_SECONDS:
+        return None
+    return entry
+
+
+def _cache_store(key: str, etag: str | None, data):
+    if not etag:
+        return
+
+    with _CACHE_LOCK, shelve.open(str(CACHE_PATH)) as cache:
+        cache[key] = {"etag": etag, "data": data, "fetched_at": time.time()}
+
+
+def _cached_get(url: str, accept: str | None = None):
+    """
+    GET a GitHub API url and return the decoded JSON (or the body text when
+    `accept` asks for the raw media type), or None on a non-200.
+    Responses are revalidated with If-None-Match against the on-disk cache.
+    """
+    # The same url can answer differently per media type
+    key = f"{accept} {url}" if accept else url
+    entry = _cache_lookup(key)
+
+    headers = {}
+    if accept:
+        headers["Accept"] = accept
+    if entry:
+        headers["If-None-Match"] = entry["etag"]
+
+    r = SESSION.get(url, headers=headers, timeout=GITHUB_API_TIMEOUT)
+
+    if r.status_code == 304 and entry:
+        return entry["data"]
 
+    if r.status_code != 200:
+        return None
 
-import requests
+    data = r.text if accept == RAW_MEDIA_TYPE else r.json()
+    _cache_store(key, r.headers.get("ETag"), data)
 
-def get_default_branch(owner: str, repo: str) -> str:
-    url = f"https://api.github.com/repos/{owner}/{repo}"
-    r = requests.get(url)
+    return data
 
-    if r.status_code != 200:
-        raise Exception("Repository not found")
 
-    data = r.json()
-    return data["default_branch"]
+@functools.lru_cache(maxsize=64)
+def parse_github_url(repo_url: str) -> tuple[str, str]:
+    parts = urlparse(repo_url).path.strip("/").split("/", 2)
+    return parts[0], parts[1]
+
 
-def get_repo_file_index(repo_url: str,repo_language: str = "python") -> dict:
+def get_repo_file_index(repo_url: str,repo_language: str = "python") -> RepoFiles:
     owner, repo = parse_github_url(repo_url)
 
-    branch = get_default_branch(owner, repo)
+    # The trees endpoint resolves HEAD to the default branch itself,
+    # so there is no need for a separate repo metadata round-trip
+    names = list_repo_files(owner, repo, "HEAD", repo_language)
 
-    files = list_repo_files(owner, repo, branch)
+    return _lazy_repo_files(owner, repo, "HEAD", names)
 
-    return files
 
+def _lazy_repo_files(owner: str, repo: str, branch: str, names: frozenset[str]) -> RepoFiles:
+    # Only the files a resolver actually reads get downloaded
+    return RepoFiles(names, functools.partial(get_file_content, owner, repo, branch))
 
-import requests
 
+def list_repo_files(owner: str, repo: str, branch: str = "HEAD", repo_language: str = "python") -> frozenset[str]:
+    return _filter_tree(_fetch_tree(owner, repo, branch), repo_language)
 
-def list_repo_files(owner: str, repo: str, branch: str, repo_language: str = "python") -> dict:
-    
-    url = f"https://api.github.com/repos/{owner}/{repo}/contents"
-    params = {"ref": branch}
 
-    r = requests.get(url, params=params)
+def _filter_tree(paths: Iterable[str], repo_language: str) -> frozenset[str]:
 
-    if r.status_code != 200:
+    # Normalize language key
+    repo_language = repo_language.lower()
+
+    if repo_language not in EXPECTED_FILES_BY_LANG:
+        return frozenset()
+
+    # Filter only matching build files; callers only ever check names
+    expected_files = EXPECTED_FILES_BY_LANG[repo_language]
+    return frozenset(path for path in paths if path in expected_files)
+
+
+def _tree_url(owner: str, repo: str, branch: str) -> str:
+    return f"https://api.github.com/repos/{owner}/{repo}/git/trees/{branch}"
+
+
+@functools.cache
+def get_file_content(owner: str, repo: str, branch: str, path: str) -> str:
+    url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}?ref={branch}"
+
+    # The raw media type returns the file body itself instead of base64 JSON
+    content = _cached_get(url, accept=RAW_MEDIA_TYPE)
+
+    if content is None:
+        raise Exception(f"Could not fetch {path}")
+
+    return content
+
+
+@functools.cache
+def _fetch_tree(owner: str, repo: str, branch: str) -> tuple[str, ...]:
+    data = _cached_get(_tree_url(owner, repo, branch))
+
+    if data is None:
         raise Exception("Could not fetch repository contents")
 
-    items = r.json()
+    # Non-recursive tree = only root-level file/directory entries.
+    # Kept as a tuple so the cached value can't be mutated by callers
+    return tuple(item["path"] for item in data["tree"])
 
-    # Get only root-level file/directory names
-    repo_items = {item["name"]: item["type"] for item in items}
 
-    # Normalize language key
-    repo_language = repo_language.lower()
+async def _fetch_json(session, url: str):
+    # Revalidated against the same on-disk cache as _cached_get
+    entry = _cache_lookup(url)
+    headers = {"If-None-Match": entry["etag"]} if entry else {}
+
+    # Same retry policy as the requests adapter mounted on SESSION
+    for attempt in range(RETRY_TOTAL + 1):
+        async with session.get(url, headers=headers) as r:
+            if r.status == 304 and entry:
+                return entry["data"]
+            if r.status == 200:
+                data = await r.json()
+                _cache_store(url, r.headers.get("ETag"), data)
+                return data
+            if r.status not in RETRY_STATUSES or attempt == RETRY_TOTAL:
+                raise Exception("Could not fetch repository contents")
 
-    if repo_language not in LANGUAGE_BUILD_MAP:
-        return {}
+        await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+
+async def _fetch_repo(session, repo_url: str, repo_language: str) -> frozenset[str]:
+    owner, repo = parse_github_url(repo_url)
 
-    build_config = LANGUAGE_BUILD_MAP[repo_language]
+    data = await _fetch_json(session, _tree_url(owner, repo, "HEAD"))
 
-    # Flatten expected build filenames
-    expected_files = set()
-    for file_list in build_config.values():
-        expected_files.update(file_list)
+    return _filter_tree((item["path"] for item in data["tree"]), repo_language)
 
-    # Filter only matching build files
-    filtered = {
-        name: repo_items[name]
-        for name in repo_items
-        if name in expected_files
-    }
 
-    return filtered
+async def get_repo_file_index_async(repo_urls: list[str], repo_language: str = "python") -> list[RepoFiles]:
+    """
+    Same as get_repo_file_index for many repos at once; the requests run
+    concurrently over one connection pool, results come back in input order.
+    """
+    # Only needed for the batch path; get_repo_file_index works without it
+    import aiohttp
 
+    async with aiohttp.ClientSession(
+        headers=dict(SESSION.headers),
+        connector=aiohttp.TCPConnector(limit=10),
+        timeout=aiohttp.ClientTimeout(total=GITHUB_API_TIMEOUT),
+    ) as session:
+        indexes = await asyncio.gather(*[
+            _fetch_repo(session, repo_url, repo_language) for repo_url in repo_urls
+        ])
 
+    return [
+        _lazy_repo_files(*parse_github_url(repo_url), "HEAD", names)
+        for repo_url, names in zip(repo_urls, indexes)
+    ]
 
 
+if __name__ == "__main__":
+    from Orchestration.base_image.python_image import resolve_python_version
 
-    
-repo_files = get_repo_file_index("https://github.com/scikit-learn/scikit-learn")
-python_versoin = resolve_python_version(repo_files)
-print(python_versoin)
-# build_type = detect_python_build_type(repo_files)
-# print(build_type)
\ No newline at end of file
+    repo_files = get_repo_file_index("https://github.com/scikit-learn/scikit-learn")
+    python_version = resolve_python_version(repo_files)
+    print(python_version)
@@ -1,50 +1,59 @@
 import os
+from pathlib import Path
+from Orchestration.types import InstallPlan
+
+
+# Everything up to the language-specific steps is the same for every repo,
+# so it's kept as one pre-joined string and only the variable parts are filled in
+_BASE_TEMPLATE = """\
+FROM {base_image}
+
+ENV DEBIAN_FRONTEND=noninteractive
+
+RUN apt-get update && apt-get install -y \\
+    git \\
+    build-essential \\
+    bash \\
+    sudo \\
+    curl \\
+    ca-certificates \\
+    --no-install-recommends \\
+    && rm -rf /var/lib/apt/lists/*
+
+RUN mkdir -p /working_directory/testbed
+
+WORKDIR /working_directory/testbed
+
+RUN git clone {repo_url} {repo_name}
+
+WORKDIR /working_directory/testbed/{repo_name}
+
+"""
 
 
 def create_dockerfile(
     base_image: str,
     repo_name: str,
     repo_url: str,
-    install_steps: list[str] | None = None,
+    install_plan: InstallPlan | None = None,
     output_path: str = "Dockerfile",
 ):
-    install_steps = install_steps or []
-
-    base_lines = [
-        f"FROM {base_image}",
-        "",
-        "ENV DEBIAN_FRONTEND=noninteractive",
-        "",
-        "RUN apt-get update && apt-get install -y \\",
-        "    git \\",
-        "    build-essential \\",
-        "    bash \\",
-        "    sudo \\",
-        "    curl \\",
-        "    ca-certificates \\",
-        "    --no-install-recommends \\",
-        "    && rm -rf /var/lib/apt/lists/*",
-        "",
-        "RUN mkdir -p /working_directory/testbed",
-        "",
-        "WORKDIR /working_directory/testbed",
-        "",
-        f"RUN git clone {repo_url} {repo_name}",
-        "",
-        f"WORKDIR /working_directory/testbed/{repo_name}",
-        "",
-    ]
+    install_plan = install_plan or InstallPlan([])
 
-    # Inject language-specific install/build steps
-    base_lines.extend(install_steps)
+    dockerfile_content = _BASE_TEMPLATE.format(
+        base_image=base_image,
+        repo_url=repo_url,
+        repo_name=repo_name,
+    )
 
-    # If no CMD was defined in install_steps, fallback to bash
-    if not any(step.strip().startswith("CMD") for step in install_steps):
-        base_lines.append('CMD ["/bin/bash"]')
+    # Inject language-specific install/build steps
+    if install_plan.steps:
+        dockerfile_content += "\n".join(install_plan.steps) + "\n"
 
-    dockerfile_content = "\n".join(base_lines)
+    # If no CMD was defined in the install plan, fallback to bash
+    if not install_plan.has_cmd:
+        dockerfile_content += 'CMD ["/bin/bash"]\n'
 
-    with open(output_path, "w") as f:
-        f.write(dockerfile_content)
+    Path(output_path).write_text(dockerfile_content)
 
     print(f"Dockerfile created at {os.path.abspath(output_path)}")
@@ -1,91 +1,55 @@
+import asyncio
 import yaml
-from Orchestration.Python.create_dockerfile import create_dockerfile
+from Orchestration.create_dockerfile import create_dockerfile
+from Orchestration.base_image_extractor import get_repo_file_index, get_repo_file_index_async
+from Orchestration.pipelines import PIPELINES
 from pathlib import Path
-if __name__ == "__main__":
-
-    BASE_DIR = Path(__file__).resolve().parent
-    config_path = BASE_DIR / "orchestration_config.yaml"
-    with open(config_path, "r") as f:
-        config = yaml.safe_load(f)
 
-    repo_url = config["repository"]["url"]
-    repo_name = config["repository"]["name"]
-    
-    
-    repo_laanguage = config["type"]
-    
-    if repo_laanguage == "python":
-        from Orchestration.Python.base_image_extractor import get_repo_file_index, resolve_python_version
-        from Orchestration.Python.base_image.python_image import python_version_to_image,detect_python_build_type, PythonBuildType,python_install_commands
-
-        repo_files = get_repo_file_index(repo_url)
-        python_version = resolve_python_version(repo_files)
-        base_image = python_version_to_image(python_version)
-        build_types = detect_python_build_type(repo_files)
-        install_steps = python_install_commands(build_types)
-
-        create_dockerfile(base_image, repo_name, repo_url,install_steps)
-    elif repo_laanguage == "go":
-        from Orchestration.Python.base_image_extractor import get_repo_file_index
-        from Orchestration.Python.base_image.go_image import (
-            resolve_go_version,
-            go_version_to_image,
-            detect_go_build_type,
-            go_install_commands
-        )
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
-        repo_files = get_repo_file_index(repo_url)
 
-        go_version = resolve_go_version(repo_files)
-        base_image = go_version_to_image(go_version)
+def build_dockerfile(repository: dict, repo_files, repo_laanguage: str, output_path: str = "Dockerfile"):
+    create_dockerfile(
+        repo_name=repository["name"],
+        repo_url=repository["url"],
+        output_path=output_path,
+        **PIPELINES[repo_laanguage](repo_files),
+    )
 
-        build_type = detect_go_build_type(repo_files)
-        install_steps = go_install_commands(build_type)
 
-        create_dockerfile(
-            base_image=base_image,
-            repo_name=repo_name,
-            repo_url=repo_url,
-            install_steps=install_steps
-        )
+async def process_all(repositories: list[dict], repo_laanguage: str):
+    # Fetch every repo's file index concurrently
+    repo_urls = [repository["url"] for repository in repositories]
+    indexes = await get_repo_file_index_async(repo_urls, repo_laanguage)
 
-    elif repo_laanguage == "rust":
-        from Orchestration.Python.base_image_extractor import get_repo_file_index
-        from Orchestration.Python.base_image.rust_image import (
-            resolve_rust_version,
-            rust_version_to_image,
-            detect_rust_build_type,
-            rust_install_commands,
+    # Pipelines read manifests lazily with blocking requests calls, so run
+    # each repo in a worker thread to keep those downloads parallel too
+    await asyncio.gather(*[
+        asyncio.to_thread(
+            build_dockerfile, repository, repo_files, repo_laanguage, f"Dockerfile.{repository['name']}"
         )
+        for repository, repo_files in zip(repositories, indexes)
+    ])
 
-        repo_files = get_repo_file_index(repo_url)
-
-        # Resolve Rust version
-        rust_version = resolve_rust_version(repo_files)
-        base_image = rust_version_to_image(rust_version)
 
-        # Detect build type (Cargo etc.)
-        build_type = detect_rust_build_type(repo_files)
-
-        # Generate install/build steps (includes dynamic binary name)
-        install_steps = rust_install_commands(build_type, repo_files)
+if __name__ == "__main__":
 
-        create_dockerfile(
-            base_image=base_image,
-            repo_name=repo_name,
-            repo_url=repo_url,
-            install_steps=install_steps,
-        )
+    BASE_DIR = Path(__file__).resolve().parent
+    config_path = BASE_DIR / "orchestration_config.yaml"
+    config = yaml.load(config_path.read_bytes(), Loader=SafeLoader)
 
-    elif repo_laanguage == "javascript":
-        from Orchestration.Python.base_image_extractor import get_repo_file_index
-        from Orchestration.Python.base_image.node_version import resolve_node_version, node_version_to_image,js_install_commands,detect_js_build_type, JSBuildType
+    # Either a single `repository` or a `repositories` list
+    repositories = config.get("repositories") or [config["repository"]]
 
-        repo_files = get_repo_file_index(repo_url)
-        js_version = resolve_node_version(repo_files)
-        base_image = node_version_to_image(js_version)
-        build_types = detect_js_build_type(repo_files)
-        install_steps = js_install_commands(build_types)
+    repo_laanguage = config["type"]
 
-        create_dockerfile(base_image, repo_name, repo_url,install_steps)
-    
\ No newline at end of file
+    # A single repo gains nothing from the batch path (and doesn't need aiohttp)
+    if len(repositories) == 1:
+        repository = repositories[0]
+        build_dockerfile(repository, get_repo_file_index(repository["url"], repo_laanguage), repo_laanguage)
+    else:
+        asyncio.run(process_all(repositories, repo_laanguage))
@@ -0,0 +1,63 @@
+from collections.abc import Callable, Mapping
+from Orchestration.helper import detect_build_type
+from Orchestration.base_image.python_image import (
+    resolve_python_version,
+    python_version_to_image,
+    python_install_commands,
+)
+from Orchestration.base_image.go_image import (
+    resolve_go_version,
+    go_version_to_image,
+    go_install_commands,
+)
+from Orchestration.base_image.rust_image import (
+    resolve_rust_version,
+    rust_version_to_image,
+    rust_install_commands,
+)
+from Orchestration.base_image.node_version import (
+    resolve_node_version,
+    node_version_to_image,
+    js_install_commands,
+)
+
+
+# Each pipeline takes a repo file index (see get_repo_file_index) and returns
+# the base_image / install_plan arguments for create_dockerfile
+
+def python_pipeline(files: Mapping[str, str]) -> dict:
+    return dict(
+        base_image=python_version_to_image(resolve_python_version(files)),
+        install_plan=python_install_commands(detect_build_type(files, "python")),
+    )
+
+
+def go_pipeline(files: Mapping[str, str]) -> dict:
+    return dict(
+        base_image=go_version_to_image(resolve_go_version(files)),
+        install_plan=go_install_commands(detect_build_type(files, "go")),
+    )
+
+
+def rust_pipeline(files: Mapping[str, str]) -> dict:
+    return dict(
+        base_image=rust_version_to_image(resolve_rust_version(files)),
+        # Needs the files too, for the binary name in Cargo.toml
+        install_plan=rust_install_commands(detect_build_type(files, "rust"), files),
+    )
+
+
+def js_pipeline(files: Mapping[str, str]) -> dict:
+    return dict(
+        base_image=node_version_to_image(resolve_node_version(files)),
+        install_plan=js_install_commands(detect_build_type(files, "javascript")),
+    )
+
+
+PIPELINES: dict[str, Callable[[Mapping[str, str]], dict]] = {
+    "python": python_pipeline,
+    "go": go_pipeline,
+    "rust": rust_pipeline,
+    "javascript": js_pipeline,
+    "js": js_pipeline,
+}
@@ -0,0 +1,40 @@
+import pytest
+
+from Orchestration.helper import detect_build_type
+from Orchestration.base_image.python_image import detect_python_build_type, python_install_commands
+from Orchestration.types import GoBuildType, JSBuildType, PythonBuildType, RustBuildType
+
+
+@pytest.mark.parametrize("files, lang, expected", [
+    ({"setup.py", "pyproject.toml"}, "python", PythonBuildType.PYPROJECT),
+    ({"requirements.txt", "setup.py"}, "python", PythonBuildType.SETUP),
+    ({"environment.yaml", "Pipfile"}, "python", PythonBuildType.PIPFILE),
+    ({"package.json", "yarn.lock", "pnpm-lock.yaml"}, "javascript", JSBuildType.PNPM),
+    ({"package-lock.json", "yarn.lock"}, "js", JSBuildType.YARN),
+    ({"package.json"}, "javascript", JSBuildType.NPM),
+    ({"vendor", "main.go"}, "go", GoBuildType.VENDOR),
+    ({"vendor", "go.mod"}, "go", GoBuildType.MODULES),
+    ({"Cargo.toml"}, "rust", RustBuildType.CARGO),
+    ({"README.md"}, "python", PythonBuildType.UNKNOWN),
+    (set(), "go", GoBuildType.UNKNOWN),
+])
+def test_detect_build_type_follows_build_file_priority(files, lang, expected):
+    assert detect_build_type(files, lang) is expected
+
+
+def test_detected_python_build_type_yields_install_steps():
+    files = {"pyproject.toml": '[project]\nrequires-python = ">=3.9"\n'}
+
+    plan = python_install_commands(detect_build_type(files, "python"))
+
+    assert "COPY pyproject.toml ." in plan.steps
+
+
+def test_wrapper_build_type_matches_install_commands():
+    files = {"requirements.txt": "requests\n", "setup.py": ""}
+
+    build_type = detect_python_build_type(files)
+    plan = python_install_commands(build_type)
+
+    assert build_type is PythonBuildType.SETUP
+    assert plan.steps == ["COPY . .", "RUN pip install ."]
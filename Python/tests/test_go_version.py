@@ -0,0 +1,17 @@
+import pytest
+
+from Orchestration.base_image.go_image import _GO_VERSION_RE, _go_directive
+
+
+@pytest.mark.parametrize("content, expected", [
+    ("module m\n\ngo 1.21\n", "1.21"),
+    ("module m\n\ngo 1.21rc1\n", "1.21"),
+    ("module m\n\ngo\t1.22.3 // pinned\n", "1.22.3"),
+    ("  go 1.20\ngo 1.19\n", "1.19"),
+    ("module m\n\ntoolchain go1.22\n", None),
+])
+def test_fast_path_agrees_with_directive_regex(content, expected):
+    match = _GO_VERSION_RE.search(content)
+
+    assert _go_directive(content) == expected
+    assert (match.group(1) if match else None) == expected
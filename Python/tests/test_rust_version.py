@@ -0,0 +1,22 @@
+from Orchestration.base_image.rust_image import DEFAULT_RUST_VERSION, resolve_rust_version
+
+
+def test_package_rust_version_picks_highest_supported():
+    files = {"Cargo.toml": '[package]\nname = "app"\nrust-version = "1.72"\n'}
+
+    assert resolve_rust_version(files) == "1.75"
+
+
+def test_workspace_inherited_rust_version_is_resolved_from_workspace_package():
+    files = {"Cargo.toml": (
+        '[workspace.package]\nrust-version = "1.74"\n\n'
+        '[package]\nname = "app"\nrust-version.workspace = true\n'
+    )}
+
+    assert resolve_rust_version(files) == "1.75"
+
+
+def test_workspace_inherited_rust_version_without_root_falls_back():
+    files = {"Cargo.toml": '[package]\nname = "app"\nrust-version.workspace = true\n'}
+
+    assert resolve_rust_version(files) == DEFAULT_RUST_VERSION
@@ -0,0 +1,50 @@
+import pytest
+from packaging.specifiers import SpecifierSet
+from packaging.version import Version
+
+from Orchestration.base_image.version_range import highest_compatible, spec_bounds
+
+CANDIDATES = sorted(
+    ((v, Version(v)) for v in ["3.8", "3.9", "3.9.2", "3.10", "3.10.1", "3.11", "3.12", "4.0"]),
+    key=lambda c: c[1],
+)
+
+
+def _scan(specifier):
+    spec = SpecifierSet(specifier)
+    return next((v for v, parsed in reversed(CANDIDATES) if parsed in spec), None)
+
+
+@pytest.mark.parametrize("specifier", [
+    "",
+    ">=3.8,<4",
+    "~=3.9",
+    "~=3.9.1",
+    "~=3.10.0",
+    "==3.10",
+    "==3.10.1",
+    ">3.10",
+    ">3.10.1",
+    "<3.10",
+    "<=3.10",
+    ">=3.10,<3.11",
+    ">3.9.2,<3.10.1",
+    ">=3.12,<3.11",
+    ">3.12,<4.0",
+    "<3.8",
+    ">4.0",
+])
+def test_interval_pick_matches_specifierset_scan(specifier):
+    assert spec_bounds(specifier) is not None
+    assert highest_compatible(specifier, CANDIDATES) == _scan(specifier)
+
+
+@pytest.mark.parametrize("specifier", [
+    "!=3.12",
+    ">=3.8,!=3.11.*",
+    "==3.10.*",
+    ">=3.9,<3.12rc1",
+])
+def test_non_interval_specifiers_fall_back_to_specifierset(specifier):
+    assert spec_bounds(specifier) is None
+    assert highest_compatible(specifier, CANDIDATES) == _scan(specifier)
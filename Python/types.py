@@ -17,6 +17,10 @@ PYTHON_BUILD_FILES = {
     PythonBuildType.CONDA: ["environment.yml", "environment.yaml"],
 }
 
+# Reverse maps (filename -> build type); insertion order follows the
+# priority order of the *_BUILD_FILES dicts above
+PYTHON_FILE_TO_TYPE = {f: bt for bt, fs in PYTHON_BUILD_FILES.items() for f in fs}
+
 from enum import StrEnum
 
 class JSBuildType(StrEnum):
@@ -31,6 +35,8 @@ JS_BUILD_FILES = {
     JSBuildType.NPM: ["package-lock.json", "package.json"],
 }
 
+JS_FILE_TO_TYPE = {f: bt for bt, fs in JS_BUILD_FILES.items() for f in fs}
+
 
 class GoBuildType(Enum):
     MODULES = "modules"
@@ -48,6 +54,8 @@ GO_BUILD_FILES = {
     GoBuildType.VENDOR: ["vendor"],  # directory
 }
 
+GO_FILE_TO_TYPE = {f: bt for bt, fs in GO_BUILD_FILES.items() for f in fs}
+
 
 class RustBuildType(Enum):
     CARGO = "cargo"
@@ -58,21 +66,67 @@ RUST_BUILD_FILES = {
     RustBuildType.CARGO: ["Cargo.toml"],
 }
 
+RUST_FILE_TO_TYPE = {f: bt for bt, fs in RUST_BUILD_FILES.items() for f in fs}
 
 
+
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Optional
+
+
+class RepoFiles(Mapping):
+    """
+    Root-level file index of a repo. Membership/iteration only use the names;
+    a file's content is fetched (via `fetch(name)`) the first time it's read.
+    """
+
+    def __init__(self, names: frozenset[str], fetch: Callable[[str], str]):
+        self.names = names
+        self._fetch = fetch
+
+    def __getitem__(self, name: str) -> str:
+        if name not in self.names:
+            raise KeyError(name)
+        return self._fetch(name)
+
+    def __contains__(self, name) -> bool:
+        return name in self.names
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+@dataclass
+class InstallPlan:
+    steps: list[str]
+    # Whether steps already end in a CMD, so the Dockerfile needs no fallback
+    has_cmd: bool = False
+
 
 @dataclass
 class RepoContext:
     repo_url: str
-    files: Dict[str, str]
+    files: Mapping[str, str]
     language: Optional[str] = None
     build_type: Optional[str] = None
     runtime_version: Optional[str] = None
     docker_image: Optional[str] = None
 
 
+# Files the resolve_*_version helpers read, in addition to the build files
+VERSION_FILES_BY_LANG = {
+    "python": [".python-version", "runtime.txt", "pyproject.toml", "Pipfile", "setup.py"],
+    "javascript": [".nvmrc", ".node-version", "package.json"],
+    "js": [".nvmrc", ".node-version", "package.json"],
+    "go": ["go.mod", "go.work"],
+    "rust": ["rust-toolchain.toml", "rust-toolchain", "Cargo.toml"],
+}
+
+
 LANGUAGE_BUILD_MAP = {
     "python": PYTHON_BUILD_FILES,
     "javascript": JS_BUILD_FILES,
@@ -80,3 +134,17 @@ LANGUAGE_BUILD_MAP = {
     "go": GO_BUILD_FILES,
     "rust": RUST_BUILD_FILES,
 }
+
+FILE_TO_BUILD_TYPE = {
+    "python": PYTHON_FILE_TO_TYPE,
+    "javascript": JS_FILE_TO_TYPE,
+    "js": JS_FILE_TO_TYPE,
+    "go": GO_FILE_TO_TYPE,
+    "rust": RUST_FILE_TO_TYPE,
+}
+
+# Flattened build + version filenames per language
+EXPECTED_FILES_BY_LANG = {
+    lang: frozenset(f for fs in cfg.values() for f in fs) | frozenset(VERSION_FILES_BY_LANG[lang])
+    for lang, cfg in LANGUAGE_BUILD_MAP.items()
+}